@@ -1,25 +1,88 @@
 """Основной модуль FastAPI приложения RFSD Backend."""
 
+import asyncio
+import json
 import logging
+import weakref
+from contextlib import asynccontextmanager
 from time import perf_counter
 from typing import Any
 
-from fastapi import FastAPI, HTTPException, Query
+from cachetools import TTLCache
+from fastapi import FastAPI, HTTPException, Query, Response
 import polars as pl
 
 from . import schemas
-from .rfsd_loader import filter_inn_year, get_schema_columns, sample_year
+from .rfsd_loader import (
+    clear_schema_cache,
+    filter_inn_year_lazy,
+    get_schema_column_set,
+    list_available_years,
+    sample_year_lazy,
+)
 from .settings import settings
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+
+async def _warm_schema_cache() -> None:
+    """Заранее читает схемы Parquet всех лет, чтобы первые запросы не ждали HF."""
+
+    years = list_available_years()
+
+    async def _warm(year: int) -> frozenset[str]:
+        # Тот же лимит, что и у запросов: прогрев не должен забирать все соединения к HF.
+        async with _scan_semaphore():
+            return await asyncio.to_thread(get_schema_column_set, year)
+
+    results = await asyncio.gather(*(_warm(year) for year in years), return_exceptions=True)
+    failed = [year for year, result in zip(years, results) if isinstance(result, Exception)]
+    if failed:
+        logger.warning("Не удалось прогреть кеш схем для годов: %s", failed)
+    else:
+        logger.info("Кеш схем прогрет: %d лет", len(years))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Жизненный цикл приложения: фоновый прогрев кеша схем при старте."""
+
+    warmup_task = asyncio.create_task(_warm_schema_cache()) if settings.warmup_schema_cache else None
+    yield
+    if warmup_task is not None:
+        warmup_task.cancel()
+
+
 app = FastAPI(
     title="RFSD Backend",
     description="Backend сервис для Russian Financial Statements Database",
     version="0.1.0",
+    lifespan=lifespan,
+)
+
+# Ограничивает число одновременных сканов Parquet, которые запускают запросы.
+# asyncio.Semaphore привязывается к event loop, поэтому семафор свой на каждый loop
+# (TestClient, повторный asyncio.run и т.п.), а не один на модуль.
+_scan_semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    weakref.WeakKeyDictionary()
 )
 
+
+def _scan_semaphore() -> asyncio.Semaphore:
+    """Семафор сканов Parquet для текущего event loop."""
+
+    loop = asyncio.get_running_loop()
+    semaphore = _scan_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _scan_semaphores[loop] = asyncio.Semaphore(settings.max_concurrent_scans)
+    return semaphore
+
+
+# Сэмплы по ключу (year, fields, limit): endpoint отладочный и часто
+# вызывается с одними и теми же параметрами.
+_sample_cache: TTLCache = TTLCache(maxsize=256, ttl=settings.sample_cache_ttl)
+
 _DEFAULT_FIELDS = [
     "inn",
     "year",
@@ -32,12 +95,35 @@ _DEFAULT_FIELDS = [
 ]
 
 
+def _rows_json_response(payload: dict[str, Any], rows: pl.DataFrame) -> Response:
+    """JSON-ответ с ключом ``rows``, сериализованным напрямую из Polars.
+
+    Строки не превращаются в ``list[dict]`` через ``to_dicts()``: Polars пишет их
+    в JSON сам, остальная часть ответа (небольшая) сериализуется через json.
+    """
+
+    head = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))[:-1]
+    sep = "," if payload else ""
+    return Response(
+        content=f'{head}{sep}"rows":{rows.write_json()}}}',
+        media_type="application/json",
+    )
+
+
 @app.get("/health")
 async def health_check() -> dict[str, str]:
     """Проверка здоровья сервиса."""
     return {"status": "ok"}
 
 
+@app.post("/rfsd/clear_schema_cache")
+async def clear_schema_cache_endpoint() -> dict[str, str]:
+    """Сбрасывает кеш схем Parquet (нужно, если датасет на HF был обновлён)."""
+    clear_schema_cache()
+    _sample_cache.clear()
+    return {"status": "ok"}
+
+
 @app.get("/rfsd/sample")
 async def get_sample(
     year: int = Query(default=2023, ge=2011, le=2024, description="Год данных"),
@@ -46,7 +132,8 @@ async def get_sample(
         default="inn,year",
         description="Список полей через запятую",
     ),
-) -> dict[str, Any]:
+    no_cache: bool = Query(default=False, description="Не использовать кеш сэмплов"),
+) -> Response:
     """Быстрый endpoint для получения сэмпла данных без полной загрузки."""
 
     # Парсим fields
@@ -56,21 +143,25 @@ async def get_sample(
         fields_list = ["inn", "year"]
 
     try:
-        df = sample_year(year=year, columns=fields_list, n=limit)
-        rows = df.to_dicts()
-
-        return {
-            "year": year,
-            "columns": fields_list,
-            "rows": rows,
-        }
+        cache_key = (year, tuple(fields_list), limit)
+        df = None if no_cache else _sample_cache.get(cache_key)
+        if df is None:
+            df = await sample_year_lazy(year=year, columns=fields_list, n=limit).collect_async()
+            _sample_cache[cache_key] = df
+
+        return _rows_json_response({"year": year, "columns": fields_list}, df)
     except Exception as e:
-        logger.error(f"Ошибка при получении sample: {e}", exc_info=True)
+        logger.error("Ошибка при получении sample: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/rfsd/company_timeseries", response_model=schemas.TableResponse)
-async def company_timeseries(request: schemas.CompanyTimeseriesRequest) -> schemas.TableResponse:
+@app.post(
+    "/rfsd/company_timeseries",
+    # Ответ собирается вручную (без повторной валидации строк через pydantic),
+    # схема TableResponse остаётся в документации OpenAPI.
+    responses={200: {"model": schemas.TableResponse}},
+)
+async def company_timeseries(request: schemas.CompanyTimeseriesRequest) -> Response:
     """Поиск компании по ИНН в нескольких годах."""
 
     # Определяем годы для сканирования
@@ -83,67 +174,71 @@ async def company_timeseries(request: schemas.CompanyTimeseriesRequest) -> schem
     dropped_fields: list[str] = []
     if years_to_scan:
         # Берем схему первого года как эталон
-        schema_columns = get_schema_columns(years_to_scan[0])
-        # year всегда доступен (виртуальная колонка)
-        valid_fields = [f for f in fields if f in schema_columns or f == "year"]
-        dropped_fields = [f for f in fields if f not in valid_fields]
+        # Чтение схемы при промахе кеша идёт по сети в HF, поэтому уводим его в поток.
+        schema_columns = await asyncio.to_thread(get_schema_column_set, years_to_scan[0])
+        # year всегда входит в схему (виртуальная колонка)
+        valid_fields = [f for f in fields if f in schema_columns]
+        dropped_fields = [f for f in fields if f not in schema_columns]
         fields = valid_fields
 
     logger.info(
-        f"company_timeseries: inn={request.inn}, years={years_to_scan}, "
-        f"fields={fields}, limit={request.limit}"
+        "company_timeseries: inn=%s, years=%s, fields=%s, limit=%d",
+        request.inn, years_to_scan, fields, request.limit,
     )
 
     start_time = perf_counter()
     frames: list = []
     per_year_elapsed_ms: dict[int, float] = {}
 
-    # Сканируем по годам
-    for year in years_to_scan:
+    async def _fetch(year: int) -> tuple[pl.DataFrame | None, float]:
+        """Загружает строки компании за один год и замеряет время загрузки."""
         year_start = perf_counter()
         try:
-            df = filter_inn_year(
-                year=year,
-                inn=request.inn,
-                columns=fields,
-                limit=request.limit,
-            )
-            if df.height > 0:
-                frames.append(df)
-            per_year_elapsed_ms[year] = (perf_counter() - year_start) * 1000
+            async with _scan_semaphore():
+                # Время ожидания семафора в замер года не входит.
+                year_start = perf_counter()
+                # Построение плана может прочитать схему года (сеть), поэтому тоже в потоке.
+                lf = await asyncio.to_thread(
+                    filter_inn_year_lazy,
+                    year=year,
+                    inn=request.inn,
+                    columns=fields,
+                    limit=request.limit,
+                )
+                df = await lf.collect_async()
         except Exception as e:
-            logger.warning(f"Ошибка при обработке года {year}: {e}")
-            per_year_elapsed_ms[year] = (perf_counter() - year_start) * 1000
-
-    # Конкатенируем результаты
+            logger.warning("Ошибка при обработке года %s: %s", year, e)
+            df = None
+        return df, (perf_counter() - year_start) * 1000
+
+    # Сканируем годы параллельно: collect_async выполняет запрос в пуле потоков
+    # Polars и не блокирует event loop, поэтому время ответа ~ max(год), а не сумма.
+    results = await asyncio.gather(*(_fetch(year) for year in years_to_scan))
+    # Кадры складываем по возрастанию года: после concat результат уже
+    # упорядочен по year, и отдельная сортировка не нужна.
+    for year, (df, year_elapsed_ms) in sorted(zip(years_to_scan, results), key=lambda item: item[0]):
+        per_year_elapsed_ms[year] = year_elapsed_ms
+        if df is not None and df.height > 0:
+            frames.append(df)
+
+    # Годы уже собраны в _fetch, поэтому склеиваем готовые кадры и обрезаем до limit.
+    # diagonal_relaxed приводит типы колонок, если они различаются между годами.
     if frames:
-        if len(frames) > 1:
-            result_df = pl.concat(frames, how="diagonal")
-        else:
-            result_df = frames[0]
-
-        # Сортируем по year, если колонка есть
-        if "year" in result_df.columns:
-            result_df = result_df.sort("year")
-
-        # Обрезаем до limit
-        if result_df.height > request.limit:
-            result_df = result_df.head(request.limit)
+        result_df = pl.concat(frames, how="diagonal_relaxed").head(request.limit)
 
         columns = result_df.columns
-        rows = result_df.to_dicts()
         matched_rows = result_df.height
     else:
         # Ничего не найдено
+        result_df = pl.DataFrame()
         columns = fields
-        rows = []
         matched_rows = 0
 
     elapsed_ms = (perf_counter() - start_time) * 1000
 
     logger.info(
-        f"company_timeseries завершен: inn={request.inn}, "
-        f"matched_rows={matched_rows}, elapsed_ms={elapsed_ms:.2f}"
+        "company_timeseries завершен: inn=%s, matched_rows=%d, elapsed_ms=%.2f",
+        request.inn, matched_rows, elapsed_ms,
     )
 
     meta = {
@@ -156,9 +251,4 @@ async def company_timeseries(request: schemas.CompanyTimeseriesRequest) -> schem
     if dropped_fields:
         meta["dropped_fields"] = dropped_fields
 
-    return schemas.TableResponse(
-        columns=columns,
-        rows=rows,
-        meta=meta,
-        files=None,
-    )
+    return _rows_json_response({"columns": columns, "meta": meta, "files": None}, result_df)
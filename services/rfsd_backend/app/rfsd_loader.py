@@ -5,12 +5,15 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Iterable, Sequence
 
 import polars as pl
 
 
-_AVAILABLE_YEARS = list(range(2011, 2025))
+_MIN_YEAR, _MAX_YEAR = 2011, 2024
+_AVAILABLE_YEARS = list(range(_MIN_YEAR, _MAX_YEAR + 1))
+_AVAILABLE_YEARS_SET = frozenset(_AVAILABLE_YEARS)
 
 
 def list_available_years() -> list[int]:
@@ -20,8 +23,27 @@ def list_available_years() -> list[int]:
 
 
 def _validate_year(year: int) -> None:
-    if year not in _AVAILABLE_YEARS:
-        raise ValueError(f"Год {year} недоступен. Допустимо: {min(_AVAILABLE_YEARS)}–{max(_AVAILABLE_YEARS)}")
+    if year not in _AVAILABLE_YEARS_SET:
+        raise ValueError(f"Год {year} недоступен. Допустимо: {_MIN_YEAR}–{_MAX_YEAR}")
+
+
+def _year_path(year: int) -> str:
+    return f"hf://datasets/irlspbru/RFSD/RFSD/year={year}/*.parquet"
+
+
+@lru_cache(maxsize=16)
+def _base_scan(year: int) -> pl.LazyFrame:
+    """Базовый (без проекций) скан года, один на процесс.
+
+    LazyFrame неизменяем, поэтому его безопасно переиспользовать между запросами:
+    план и разбор метаданных Parquet не строятся заново при каждом вызове.
+
+    ``parallel="prefiltered"``: основной запрос — поиск по одному ИНН, поэтому
+    сначала декодируется колонка предиката, а остальные колонки — только для
+    совпавших строк; row group'ы, исключённые статистиками, не читаются.
+    """
+
+    return pl.scan_parquet(_year_path(year), parallel="prefiltered")
 
 
 def _scan_year(year: int, columns: Sequence[str] | None = None) -> pl.LazyFrame:
@@ -29,15 +51,16 @@ def _scan_year(year: int, columns: Sequence[str] | None = None) -> pl.LazyFrame:
 
     _validate_year(year)
 
-    path = f"hf://datasets/irlspbru/RFSD/RFSD/year={year}/*.parquet"
-    scan = pl.scan_parquet(path)
-    # Добавляем партиционный год как колонку, чтобы им можно было пользоваться и в select.
-    scan = scan.with_columns(pl.lit(year).alias("year"))
+    scan = _base_scan(year)
+    # Партиционный год добавляем как колонку, чтобы им можно было пользоваться и в select.
+    year_col = pl.lit(year).alias("year")
 
-    if columns is not None:
-        scan = scan.select(list(columns))
+    if columns is None:
+        return scan.with_columns(year_col)
 
-    return scan
+    # Проекция и литерал year в одном select: оптимизатор видит их вместе,
+    # и до Parquet доходит только список реально нужных колонок.
+    return scan.select([year_col if c == "year" else pl.col(c) for c in columns])
 
 
 def load_year(year: int, columns: Sequence[str] | None = None) -> pl.DataFrame:
@@ -54,55 +77,120 @@ def load_year(year: int, columns: Sequence[str] | None = None) -> pl.DataFrame:
     return _scan_year(year, columns=columns).collect()
 
 
-def load_years(years: Iterable[int], columns: Sequence[str] | None = None) -> pl.DataFrame:
-    """Загружает несколько лет и конкатенирует результаты вертикально."""
+def scan_years(years: Iterable[int], columns: Sequence[str] | None = None) -> pl.LazyFrame:
+    """Возвращает один ленивый скан по нескольким годам.
+
+    Сканы отдельных лет объединяются в один план, поэтому фильтры и проекции
+    оптимизируются и выполняются за один ``collect`` вместо отдельного на каждый год.
+    """
 
     years_list = list(years)
     if not years_list:
         raise ValueError("Список годов пуст")
 
-    frames: list[pl.DataFrame] = []
-    for y in years_list:
-        frames.append(load_year(y, columns=columns))
+    return pl.concat([_scan_year(y, columns=columns) for y in years_list], how="diagonal")
 
-    return pl.concat(frames, how="vertical")
+
+def load_years(years: Iterable[int], columns: Sequence[str] | None = None) -> pl.DataFrame:
+    """Загружает несколько лет и объединяет результаты в одну таблицу.
+
+    Объединение диагональное (``how="diagonal"``): набор колонок — объединение
+    колонок всех лет, а колонки, которых нет в каком-то году, заполняются null
+    (а не приводят к ошибке, как при вертикальной конкатенации).
+    """
+
+    return scan_years(years, columns=columns).collect()
+
+
+def sample_year_lazy(year: int, columns: Sequence[str] | None = None, n: int = 5) -> pl.LazyFrame:
+    """Ленивый вариант :func:`sample_year` (для ``collect_async`` в async-коде)."""
+
+    return _scan_year(year, columns=columns).limit(n)
 
 
 def sample_year(year: int, columns: Sequence[str] | None = None, n: int = 5) -> pl.DataFrame:
     """Возвращает первые n строк указанного года без полного collect."""
 
-    return _scan_year(year, columns=columns).limit(n).collect()
+    return sample_year_lazy(year, columns=columns, n=n).collect()
 
 
-def filter_inn_year(
+def filter_inn_year_lazy(
     year: int,
     inn: str,
     columns: Sequence[str],
     limit: int = 200,
-) -> pl.DataFrame:
-    """Фильтр по ИНН для указанного года, с выборкой колонок и ограничением количества строк."""
+) -> pl.LazyFrame:
+    """Ленивый вариант :func:`filter_inn_year` (для ``collect_async`` в async-коде)."""
 
     cols = list(columns)
     if "inn" not in cols:
         cols.append("inn")
 
-    return (
-        _scan_year(year, columns=cols)
-        .filter(pl.col("inn") == inn)
-        .limit(limit)
-        .collect()
-    )
+    scan = _scan_year(year, columns=cols)
 
+    # Приводим литерал к типу колонки заранее: иначе для числового inn Polars
+    # вставит приведение в предикат, и он может не дойти до статистик Parquet.
+    inn_value = pl.lit(inn)
+    inn_dtype = _schema(year).get("inn")
+    if inn_dtype is not None and inn_dtype.is_numeric():
+        inn_value = inn_value.cast(inn_dtype, strict=False)
 
-def get_schema_columns(year: int) -> list[str]:
-    """Возвращает список доступных колонок для указанного года без чтения данных."""
+    return scan.filter(pl.col("inn") == inn_value).limit(limit)
 
-    _validate_year(year)
-    path = f"hf://datasets/irlspbru/RFSD/RFSD/year={year}/*.parquet"
-    scan = pl.scan_parquet(path)
-    schema = scan.collect_schema()
+
+def filter_inn_year(
+    year: int,
+    inn: str,
+    columns: Sequence[str],
+    limit: int = 200,
+) -> pl.DataFrame:
+    """Фильтр по ИНН для указанного года, с выборкой колонок и ограничением количества строк."""
+
+    return filter_inn_year_lazy(year, inn, columns, limit=limit).collect()
+
+
+@lru_cache(maxsize=32)
+def _schema(year: int) -> pl.Schema:
+    """Читает схему года из метаданных Parquet (кешируется на время жизни процесса)."""
+
+    return _base_scan(year).collect_schema()
+
+
+@lru_cache(maxsize=32)
+def _schema_columns(year: int) -> tuple[str, ...]:
     # year добавляется виртуально, но его нет в schema, поэтому добавляем вручную
-    columns = list(schema.keys())
+    columns = list(_schema(year).keys())
     if "year" not in columns:
         columns.append("year")
-    return columns
+    return tuple(columns)
+
+
+@lru_cache(maxsize=32)
+def _schema_column_set(year: int) -> frozenset[str]:
+    return frozenset(_schema_columns(year))
+
+
+def get_schema_columns(year: int) -> list[str]:
+    """Возвращает список доступных колонок для указанного года без чтения данных.
+
+    Схема читается из метаданных Parquet один раз на год и далее берётся из кеша.
+    """
+
+    _validate_year(year)
+    return list(_schema_columns(year))
+
+
+def get_schema_column_set(year: int) -> frozenset[str]:
+    """Множество доступных колонок года (для проверок ``col in ...`` за O(1))."""
+
+    _validate_year(year)
+    return _schema_column_set(year)
+
+
+def clear_schema_cache() -> None:
+    """Сбрасывает кеш схем и базовых сканов (например, после обновления датасета)."""
+
+    _schema_column_set.cache_clear()
+    _schema_columns.cache_clear()
+    _schema.cache_clear()
+    _base_scan.cache_clear()
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from typing import Any
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 _DEFAULT_FIELDS = [
@@ -22,7 +22,13 @@ _DEFAULT_FIELDS = [
 class CompanyTimeseriesRequest(BaseModel):
     """Запрос на получение временного ряда по компании."""
 
-    inn: str = Field(..., description="ИНН компании")
+    model_config = ConfigDict(extra="forbid", frozen=True, str_strip_whitespace=True)
+
+    inn: str = Field(
+        ...,
+        pattern=r"^(?:[0-9]{10}|[0-9]{12})$",
+        description="ИНН компании (10 или 12 цифр)",
+    )
     years: list[int] | None = Field(
         default=[2022, 2023, 2024],
         description="Список годов для поиска. По умолчанию [2022, 2023, 2024]",
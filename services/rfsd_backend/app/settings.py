@@ -1,5 +1,6 @@
 """Настройки приложения RFSD Backend."""
 
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
@@ -8,6 +9,13 @@ class Settings(BaseSettings):
 
     app_name: str = "RFSD Backend"
     debug: bool = False
+    # Максимум одновременных сканов Parquet (Hugging Face) на процесс.
+    # 0 повесил бы все запросы на семафоре навсегда, поэтому минимум — 1.
+    max_concurrent_scans: int = Field(4, ge=1)
+    # Прогревать кеш схем Parquet для всех лет при старте (в фоне).
+    warmup_schema_cache: bool = True
+    # Время жизни кеша ответов /rfsd/sample, секунды.
+    sample_cache_ttl: int = 300
 
     class Config:
         env_file = ".env"
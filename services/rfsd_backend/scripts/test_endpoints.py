@@ -1,65 +1,125 @@
+import asyncio
 import httpx
 import json
 import sys
+from typing import Any, Callable, NamedTuple
+
+try:
+    import orjson
+except ImportError:  # orjson необязателен, без него работаем через stdlib json
+    orjson = None
 
 BASE_URL = "http://127.0.0.1:8000"
+JSON_HEADERS = {"content-type": "application/json"}
+# Пул соединений: параллельные проверки переиспользуют keep-alive сокеты
+LIMITS = httpx.Limits(max_keepalive_connections=8, max_connections=16, keepalive_expiry=30.0)
+# Быстрый отказ на подключении, длинное чтение — под холодные сканы Parquet
+TIMEOUT = httpx.Timeout(30.0, connect=5.0, pool=5.0)
+
+TIMESERIES_FIELDS = [
+    "inn", "year", "region", "okved_section",
+    "okved", "line_2110", "line_2300", "line_2400"
+]
+
+
+def _loads(content: bytes):
+    return orjson.loads(content) if orjson is not None else json.loads(content)
+
+
+def _dumps(obj) -> bytes:
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj).encode()
+
+
+class Case(NamedTuple):
+    """Одна проверка: запрос и функция разбора ответа."""
+
+    name: str
+    method: str
+    url: str
+    kwargs: dict[str, Any]
+    check: Callable[[Any], list[str]]
+
+
+def _chk_health(data) -> list[str]:
+    return [f"Response: {data}"]
+
 
-def run_tests():
+def _chk_sample(data) -> list[str]:
+    return [
+        f"Columns: {data.get('columns')}",
+        f"Rows count: {len(data.get('rows', []))}",
+    ]
+
+
+def _chk_timeseries(data) -> list[str]:
+    return [
+        f"Meta: {data.get('meta', {})}",
+        f"Rows matched: {len(data.get('rows', []))}",
+    ]
+
+
+HEALTH_CASE = Case("HEALTH CHECK", "GET", "/health", {}, _chk_health)
+
+CASES = [
+    Case(
+        "SAMPLE (3 rows)", "GET", "/rfsd/sample",
+        {"params": {"year": 2023, "limit": 3, "fields": "inn,year,okved_section,okved"}},
+        _chk_sample,
+    ),
+    Case(
+        "COMPANY TIMESERIES (inn 7722514880, year 2023)", "POST", "/rfsd/company_timeseries",
+        {
+            "content": _dumps({"inn": "7722514880", "years": [2023], "fields": TIMESERIES_FIELDS, "limit": 50}),
+            "headers": JSON_HEADERS,
+        },
+        _chk_timeseries,
+    ),
+    Case(
+        "COMPANY TIMESERIES (inn 7722514880, default years)", "POST", "/rfsd/company_timeseries",
+        {
+            "content": _dumps({"inn": "7722514880", "fields": TIMESERIES_FIELDS, "limit": 50}),
+            "headers": JSON_HEADERS,
+        },
+        _chk_timeseries,
+    ),
+]
+
+
+async def run_case(client: httpx.AsyncClient, case: Case) -> tuple[bool, list[str]]:
+    out = [f"== {case.name} =="]
+    resp = None
+    try:
+        resp = await client.request(case.method, case.url, **case.kwargs)
+        resp.raise_for_status()
+        out.append(f"Status: {resp.status_code}")
+        out.extend(case.check(_loads(resp.content)))
+        return True, out
+    except Exception as e:
+        out.append(f"FAILED: {e}")
+        # resp не задан, если упал сам запрос (например, сервер недоступен)
+        if resp is not None:
+            out.append(resp.text[:500])
+        return False, out
+
+
+async def run_tests():
     print(f"Checking {BASE_URL}...\n")
-    
-    with httpx.Client(base_url=BASE_URL, timeout=30.0) as client:
-        # 1. Health Check
-        print("== HEALTH CHECK ==")
-        try:
-            resp = client.get("/health")
-            resp.raise_for_status()
-            print(f"Status: {resp.status_code}")
-            print(f"Response: {resp.json()}")
-        except Exception as e:
-            print(f"FAILED: {e}")
+
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=TIMEOUT, limits=LIMITS) as client:
+        # 1. Health Check: без живого сервиса остальные проверки бессмысленны
+        ok, lines = await run_case(client, HEALTH_CASE)
+        print("\n".join(lines))
+        if not ok:
             return
 
-        print("\n== SAMPLE (3 rows) ==")
-        try:
-            resp = client.get("/rfsd/sample", params={
-                "year": 2023, 
-                "limit": 3, 
-                "fields": "inn,year,okved_section,okved"
-            })
-            resp.raise_for_status()
-            data = resp.json()
-            print(f"Status: {resp.status_code}")
-            print(f"Columns: {data.get('columns')}")
-            print(f"Rows count: {len(data.get('rows', []))}")
-            # print(json.dumps(data, indent=2, ensure_ascii=False))
-        except Exception as e:
-            print(f"FAILED: {e}")
-
-        print("\n== COMPANY TIMESERIES (inn 7722514880, year 2023) ==")
-        payload = {
-            "inn": "7722514880",
-            "years": [2023],
-            "fields": [
-                "inn", "year", "region", "okved_section", 
-                "okved", "line_2110", "line_2300", "line_2400"
-            ],
-            "limit": 50
-        }
-        
-        try:
-            resp = client.post("/rfsd/company_timeseries", json=payload)
-            resp.raise_for_status()
-            data = resp.json()
-            print(f"Status: {resp.status_code}")
-            meta = data.get("meta", {})
-            print(f"Meta: {meta}")
-            print(f"Rows matched: {len(data.get('rows', []))}")
-        except Exception as e:
-            print(f"FAILED: {e}")
-            print(resp.text)
+        # Остальные проверки независимы: запускаем их параллельно,
+        # а вывод печатаем в исходном порядке.
+        results = await asyncio.gather(*(run_case(client, case) for case in CASES))
+        for _, lines in results:
+            print("\n" + "\n".join(lines))
 
 if __name__ == "__main__":
     try:
-        run_tests()
+        asyncio.run(run_tests())
     except KeyboardInterrupt:
         sys.exit(0)
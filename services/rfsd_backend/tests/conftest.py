@@ -0,0 +1,36 @@
+"""Общие фикстуры для тестов API."""
+
+import polars as pl
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+
+from app import main, rfsd_loader
+from app.main import app
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def client():
+    """Один клиент на всю сессию: транспорт и кеши приложения переиспользуются между тестами."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture
+def write_year(tmp_path, monkeypatch):
+    """Локальные Parquet вместо Hugging Face: возвращает функцию записи данных года.
+
+    Кеши схем и сэмплов сбрасываются до и после теста.
+    """
+
+    def write(year: int, data: dict) -> None:
+        year_dir = tmp_path / f"year={year}"
+        year_dir.mkdir(exist_ok=True)
+        pl.DataFrame(data).write_parquet(year_dir / "part0.parquet")
+
+    monkeypatch.setattr(rfsd_loader, "_year_path", lambda year: str(tmp_path / f"year={year}" / "*.parquet"))
+    rfsd_loader.clear_schema_cache()
+    main._sample_cache.clear()
+    yield write
+    rfsd_loader.clear_schema_cache()
+    main._sample_cache.clear()
@@ -1,60 +1,82 @@
 """Smoke tests для API endpoints."""
 
+import asyncio
+
 import pytest
-from httpx import AsyncClient
 
-from app.main import app
+from app import main
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
 
 
-@pytest.mark.asyncio
-async def test_health():
+async def test_health(client):
     """Тест /health endpoint."""
-    async with AsyncClient(app=app, base_url="http://test") as client:
-        response = await client.get("/health")
-        assert response.status_code == 200
-        data = response.json()
-        assert data["status"] == "ok"
+    response = await client.get("/health")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "ok"
 
 
-@pytest.mark.asyncio
-async def test_sample():
+async def test_sample(client):
     """Тест /rfsd/sample endpoint."""
-    async with AsyncClient(app=app, base_url="http://test") as client:
-        response = await client.get("/rfsd/sample?year=2023&limit=3&fields=inn,year")
-        assert response.status_code == 200
-        data = response.json()
-        assert "year" in data
-        assert "columns" in data
-        assert "rows" in data
-        assert data["year"] == 2023
-        assert len(data["rows"]) <= 3
-        # Проверяем, что year присутствует в данных
-        if data["rows"]:
-            assert "year" in data["rows"][0]
-
-
-@pytest.mark.asyncio
-async def test_company_timeseries():
+    response = await client.get("/rfsd/sample?year=2023&limit=3&fields=inn,year")
+    assert response.status_code == 200
+    data = response.json()
+    assert "year" in data
+    assert "columns" in data
+    assert "rows" in data
+    assert data["year"] == 2023
+    assert len(data["rows"]) <= 3
+    # Проверяем, что year присутствует в данных
+    if data["rows"]:
+        assert "year" in data["rows"][0]
+
+
+async def test_company_timeseries(client):
     """Тест /rfsd/company_timeseries endpoint."""
-    async with AsyncClient(app=app, base_url="http://test") as client:
-        # Используем ИНН из задания
-        response = await client.post(
-            "/rfsd/company_timeseries",
-            json={
-                "inn": "0100000011",
-                "years": [2023],
-                "fields": ["inn", "year", "region"],
-                "limit": 10,
-            },
-        )
-        assert response.status_code == 200
-        data = response.json()
-        assert "columns" in data
-        assert "rows" in data
-        assert "meta" in data
-        assert isinstance(data["columns"], list)
-        assert isinstance(data["rows"], list)
-        assert isinstance(data["meta"], dict)
-        assert "years_scanned" in data["meta"]
-        assert "matched_rows" in data["meta"]
-        assert "elapsed_ms" in data["meta"]
+    # Используем ИНН из задания
+    response = await client.post(
+        "/rfsd/company_timeseries",
+        json={
+            "inn": "0100000011",
+            "years": [2023],
+            "fields": ["inn", "year", "region"],
+            "limit": 10,
+        },
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert "columns" in data
+    assert "rows" in data
+    assert "meta" in data
+    assert isinstance(data["columns"], list)
+    assert isinstance(data["rows"], list)
+    assert isinstance(data["meta"], dict)
+    assert "years_scanned" in data["meta"]
+    assert "matched_rows" in data["meta"]
+    assert "elapsed_ms" in data["meta"]
+
+
+async def test_company_timeseries_rejects_invalid_request(client):
+    """Некорректный ИНН и лишние поля отклоняются валидацией (422)."""
+    response = await client.post("/rfsd/company_timeseries", json={"inn": "12345"})
+    assert response.status_code == 422
+
+    response = await client.post(
+        "/rfsd/company_timeseries",
+        json={"inn": "0100000011", "unknown_field": 1},
+    )
+    assert response.status_code == 422
+
+
+async def test_scan_semaphore_is_per_event_loop():
+    """Семафор сканов свой для каждого event loop (TestClient, повторный asyncio.run)."""
+
+    async def other_loop_semaphore():
+        async with main._scan_semaphore():
+            return main._scan_semaphore()
+
+    current = main._scan_semaphore()
+    other = await asyncio.to_thread(asyncio.run, other_loop_semaphore())
+    assert other is not current
+    assert main._scan_semaphore() is current
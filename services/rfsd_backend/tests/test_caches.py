@@ -0,0 +1,98 @@
+"""Офлайн-тесты кешей backend: схемы Parquet, их прогрев при старте и сэмплы."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app import main
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+INN = "7722514880"
+
+
+async def test_clear_schema_cache_picks_up_new_columns(client, write_year):
+    """После сброса кеша схем новая колонка в Parquet становится доступной."""
+    write_year(2021, {"inn": [INN], "region": ["77"]})
+    payload = {"inn": INN, "years": [2021], "fields": ["inn", "year", "line_2110"]}
+
+    response = await client.post("/rfsd/company_timeseries", json=payload)
+    assert response.json()["meta"]["dropped_fields"] == ["line_2110"]
+
+    write_year(2021, {"inn": [INN], "region": ["77"], "line_2110": [100]})
+    # Схема закеширована: без сброса новая колонка по-прежнему отбрасывается
+    response = await client.post("/rfsd/company_timeseries", json=payload)
+    assert response.json()["meta"]["dropped_fields"] == ["line_2110"]
+
+    response = await client.post("/rfsd/clear_schema_cache")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+
+    data = (await client.post("/rfsd/company_timeseries", json=payload)).json()
+    assert "dropped_fields" not in data["meta"]
+    assert data["rows"] == [{"inn": INN, "year": 2021, "line_2110": 100}]
+
+
+@pytest.fixture
+def schema_calls(monkeypatch):
+    """Подменяет чтение схемы: запоминает годы и пиковое число одновременных вызовов."""
+
+    calls = {"years": [], "active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def fake_schema(year: int) -> frozenset[str]:
+        with lock:
+            calls["years"].append(year)
+            calls["active"] += 1
+            calls["peak"] = max(calls["peak"], calls["active"])
+        time.sleep(0.01)
+        with lock:
+            calls["active"] -= 1
+        return frozenset({"inn", "year"})
+
+    monkeypatch.setattr(main, "get_schema_column_set", fake_schema)
+    return calls
+
+
+async def test_lifespan_warms_schema_cache(schema_calls, monkeypatch):
+    """При старте схемы всех лет читаются в фоне, не более max_concurrent_scans сразу."""
+    monkeypatch.setattr(main.settings, "warmup_schema_cache", True)
+    years = main.list_available_years()
+
+    async with main.lifespan(main.app):
+        for _ in range(200):
+            if len(schema_calls["years"]) == len(years):
+                break
+            await asyncio.sleep(0.01)
+
+    assert sorted(schema_calls["years"]) == years
+    assert schema_calls["peak"] <= main.settings.max_concurrent_scans
+
+
+async def test_lifespan_warmup_disabled(schema_calls, monkeypatch):
+    """WARMUP_SCHEMA_CACHE=false отключает прогрев."""
+    monkeypatch.setattr(main.settings, "warmup_schema_cache", False)
+
+    async with main.lifespan(main.app):
+        await asyncio.sleep(0.05)
+
+    assert schema_calls["years"] == []
+
+
+async def test_sample_served_from_cache(client, write_year):
+    """Повторный /rfsd/sample отдаётся из кеша, no_cache=true читает свежие данные."""
+    write_year(2021, {"inn": [INN, "0100000011"]})
+    params = {"year": 2021, "limit": 2, "fields": "inn,year"}
+
+    first = (await client.get("/rfsd/sample", params=params)).json()
+    assert [row["inn"] for row in first["rows"]] == [INN, "0100000011"]
+
+    write_year(2021, {"inn": ["1111111111", "2222222222"]})
+    cached = (await client.get("/rfsd/sample", params=params)).json()
+    assert cached["rows"] == first["rows"]
+
+    fresh = (await client.get("/rfsd/sample", params={**params, "no_cache": "true"})).json()
+    assert [row["inn"] for row in fresh["rows"]] == ["1111111111", "2222222222"]
+    assert all(row["year"] == 2021 for row in fresh["rows"])
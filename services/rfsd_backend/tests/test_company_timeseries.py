@@ -0,0 +1,92 @@
+"""Офлайн-тесты /rfsd/company_timeseries на локальных Parquet вместо Hugging Face."""
+
+import polars as pl
+import pytest
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+INN = "7722514880"
+
+
+@pytest.fixture(params=[pl.String, pl.Int64], ids=["inn-str", "inn-int64"])
+def local_rfsd(request, write_year):
+    """По две строки компании за 2021–2023 и одна строка компании "0100000011".
+
+    Тип line_2110 между годами различается (Int64 / Float64), чтобы проверить
+    приведение типов при объединении. Колонка inn записывается то строкой,
+    то Int64 (в таком виде ведущий ноль ИНН теряется).
+    """
+
+    line_2110 = {
+        2021: pl.Series([1, 2], dtype=pl.Int64),
+        2022: pl.Series([3.5, 4.5], dtype=pl.Float64),
+        2023: pl.Series([5, 6], dtype=pl.Int64),
+    }
+    for year, values in line_2110.items():
+        write_year(
+            year,
+            {
+                "inn": pl.Series([INN, INN, "0100000011"]).cast(request.param),
+                "region": ["77", "77", "01"],
+                "line_2110": values.append(pl.Series([0], dtype=values.dtype)),
+            },
+        )
+
+
+async def _timeseries(client, **payload):
+    response = await client.post("/rfsd/company_timeseries", json={"inn": INN, **payload})
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_rows_ordered_by_year_with_relaxed_types(client, local_rfsd):
+    """Годы в запросе перемешаны, строки в ответе идут по возрастанию year."""
+    data = await _timeseries(client, years=[2023, 2021, 2022], fields=["inn", "year", "line_2110"])
+
+    assert [row["year"] for row in data["rows"]] == [2021, 2021, 2022, 2022, 2023, 2023]
+    assert [row["line_2110"] for row in data["rows"]] == [1.0, 2.0, 3.5, 4.5, 5.0, 6.0]
+    assert data["columns"] == ["inn", "year", "line_2110"]
+    assert data["meta"]["matched_rows"] == 6
+    assert data["meta"]["years_scanned"] == [2023, 2021, 2022]
+    assert "dropped_fields" not in data["meta"]
+
+
+async def test_limit_applies_across_years(client, local_rfsd):
+    """limit обрезает объединённый результат, начиная с младшего года."""
+    data = await _timeseries(client, years=[2022, 2023, 2021], fields=["inn", "year"], limit=3)
+
+    assert [row["year"] for row in data["rows"]] == [2021, 2021, 2022]
+    assert data["meta"]["matched_rows"] == 3
+
+
+async def test_unknown_fields_are_dropped(client, local_rfsd):
+    """Колонки, которых нет в схеме, убираются из выборки и перечисляются в meta."""
+    data = await _timeseries(client, years=[2021], fields=["inn", "year", "bogus", "region"])
+
+    assert data["columns"] == ["inn", "year", "region"]
+    assert data["meta"]["dropped_fields"] == ["bogus"]
+    assert all(set(row) == {"inn", "year", "region"} for row in data["rows"])
+
+
+async def test_inn_with_leading_zero_matches(client, local_rfsd):
+    """ИНН с ведущим нулём находится и при строковой, и при числовой колонке inn."""
+    data = await _timeseries(client, inn="0100000011", years=[2021, 2022], fields=["inn", "year"])
+
+    assert [row["year"] for row in data["rows"]] == [2021, 2022]
+    assert data["meta"]["matched_rows"] == 2
+
+
+async def test_empty_result(client, local_rfsd):
+    """Если компания не найдена, rows пуст, а columns — запрошенные поля."""
+    response = await client.post(
+        "/rfsd/company_timeseries",
+        json={"inn": "1234567890", "years": [2021, 2022], "fields": ["inn", "year"]},
+    )
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["rows"] == []
+    assert data["columns"] == ["inn", "year"]
+    assert data["files"] is None
+    assert data["meta"]["matched_rows"] == 0
+    assert set(data["meta"]["per_year_elapsed_ms"]) == {"2021", "2022"}
@@ -0,0 +1,20 @@
+"""Тесты валидации настроек."""
+
+import pytest
+from pydantic import ValidationError
+
+from app.settings import Settings
+
+
+@pytest.mark.parametrize("value", ["0", "-1"])
+def test_max_concurrent_scans_must_be_positive(monkeypatch, value):
+    monkeypatch.setenv("MAX_CONCURRENT_SCANS", value)
+
+    with pytest.raises(ValidationError):
+        Settings()
+
+
+def test_max_concurrent_scans_from_env(monkeypatch):
+    monkeypatch.setenv("MAX_CONCURRENT_SCANS", "2")
+
+    assert Settings().max_concurrent_scans == 2
@@ -8,8 +8,9 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Iterable
 
+import numpy as np
 import pandas as pd
 
 
@@ -32,6 +33,16 @@ class BaseAnalysisPipeline(ABC):
 
         return self._data
 
+    def columns_soa(self, columns: Iterable[str]) -> dict[str, np.ndarray]:
+        """Возвращает выбранные колонки как отдельные массивы NumPy.
+
+        Для числовых колонок без пропусков массивы — представления данных
+        без копирования; удобно для векторных расчётов в наследниках.
+        Массивы не предназначены для изменения.
+        """
+
+        return {column: self._data[column].to_numpy(copy=False) for column in columns}
+
     @abstractmethod
     def run(self, **kwargs: Any) -> Any:  # pragma: no cover - логика появится позже
         """Запускает основной аналитический пайплайн.
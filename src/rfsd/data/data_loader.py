@@ -1,7 +1,7 @@
 """Модуль базовой загрузки финансовой отчётности РФ (RFSD).
 
 На этом этапе реализуется минимальный интерфейс для чтения табличных данных
-(например, CSV) в `pandas.DataFrame`. Логика парсинга специфичных форм
+(CSV, Parquet, Feather) в `pandas.DataFrame`. Логика парсинга специфичных форм
 (РСБУ, МСФО и т.п.) будет добавлена на последующих этапах.
 """
 
@@ -14,18 +14,46 @@ import pandas as pd
 
 PathLike = Union[str, Path]
 
+_PARQUET_SUFFIXES = (".parquet", ".pq")
+_FEATHER_SUFFIXES = (".feather", ".arrow")
 
-def load_financial_statements(path: PathLike, *, encoding: str = "utf-8", **read_csv_kwargs) -> pd.DataFrame:
+# Узкие типы для известных колонок RFSD: коды региона и раздела ОКВЭД
+# повторяются миллионы раз, поэтому category экономит память в разы.
+# Денежные line_* оставляем float64: float32 теряет точность на суммах в рублях.
+# year — nullable Int16, чтобы пустые ячейки не ломали загрузку.
+_RFSD_DTYPES = {
+    "year": "Int16",
+    "region": "category",
+    "okved_section": "category",
+}
+
+
+def load_financial_statements(
+    path: PathLike,
+    *,
+    encoding: str = "utf-8",
+    cache_parquet: bool = False,
+    **read_csv_kwargs,
+) -> pd.DataFrame:
     """Загружает финансовые данные из табличного файла в `pandas.DataFrame`.
 
     Параметры
     ---------
     path:
-        Путь до файла с данными (обычно CSV, на старте).
+        Путь до файла с данными. Формат определяется по расширению:
+        ``.parquet``/``.pq`` читаются через :func:`pandas.read_parquet`,
+        ``.feather``/``.arrow`` — через :func:`pandas.read_feather`,
+        всё остальное считается CSV.
     encoding:
-        Кодировка входного файла. По умолчанию ``"utf-8"``.
+        Кодировка входного CSV-файла. По умолчанию ``"utf-8"``.
+    cache_parquet:
+        Только для CSV: кешировать результат в ``<имя>.csv.parquet`` и читать его,
+        пока он не старше CSV (параметры чтения не учитываются). По умолчанию ``False``.
     **read_csv_kwargs:
-        Дополнительные параметры, которые будут переданы в :func:`pandas.read_csv`.
+        Дополнительные параметры функции чтения (:func:`pandas.read_csv`,
+        :func:`pandas.read_parquet` или :func:`pandas.read_feather`).
+        CSV без параметров читается движком ``pyarrow``, с параметрами — C-движком.
+        Известные колонки RFSD, не указанные в словаре ``dtype``, приводятся к узким типам.
 
     Возвращает
     ----------
@@ -44,7 +72,55 @@ def load_financial_statements(path: PathLike, *, encoding: str = "utf-8", **read
     if not path.exists():
         raise FileNotFoundError(f"Файл с данными не найден: {path}")
 
-    # На базовом уровне считаем, что входной формат — CSV.
-    # Поддержка других форматов (Excel, Parquet, БД) будет добавлена позже.
+    suffix = path.suffix.lower()
+    if suffix in _PARQUET_SUFFIXES:
+        return pd.read_parquet(path, **read_csv_kwargs)
+    if suffix in _FEATHER_SUFFIXES:
+        return pd.read_feather(path, **read_csv_kwargs)
+
+    # Всё остальное считаем CSV. Поддержка Excel и БД будет добавлена позже.
+    if path.stat().st_size == 0:
+        # Единая ошибка для всех движков (pyarrow на пустом файле бросает ParserError).
+        raise pd.errors.EmptyDataError(f"Файл с данными пуст: {path}")
+
+    # Суффикс добавляется к полному имени, чтобы кеш data.csv не совпал с обычным
+    # data.parquet рядом. Кеш не учитывает read_csv_kwargs.
+    cache_path = path.with_name(path.name + ".parquet")
+    if cache_parquet and cache_path.exists() and cache_path.stat().st_mtime >= path.stat().st_mtime:
+        return pd.read_parquet(cache_path)
+
+    dtype = read_csv_kwargs.get("dtype")
+    # pyarrow (многопоточный парсер Arrow) выводит типы сам и лишь потом применяет
+    # dtype (ИНН "0100000011" превращается в 100000011), а часть опций pandas
+    # (например, nrows) не поддерживает. Поэтому он используется только для вызова
+    # без параметров; явный engine вызывающего имеет приоритет.
+    # Отличия pyarrow от C-движка (закреплены в tests/test_data_loader.py):
+    # ISO-даты читаются как datetime.date, пустой заголовок остаётся "" вместо
+    # "Unnamed: N", повторяющиеся заголовки не получают суффикс ".1", колонки
+    # файла только с заголовком имеют тип float64 вместо object.
+    read_csv_kwargs.setdefault("engine", "c" if read_csv_kwargs else "pyarrow")
     df = pd.read_csv(path, encoding=encoding, **read_csv_kwargs)
+
+    # Скалярный dtype — явное указание типа для всех колонок, умолчания не нужны.
+    if dtype is None or isinstance(dtype, dict):
+        df = _apply_default_dtypes(df, explicit=dtype or {})
+    if cache_parquet:
+        df.to_parquet(cache_path, index=False)
+    return df
+
+
+def _apply_default_dtypes(df: pd.DataFrame, explicit: dict) -> pd.DataFrame:
+    """Приводит известные колонки RFSD к узким типам, не трогая заданные вызывающим.
+
+    Типы по умолчанию — только оптимизация памяти, поэтому колонка, которую не
+    удалось привести (например, нечисловой ``year``), остаётся как есть.
+    """
+
+    for column, kind in _RFSD_DTYPES.items():
+        if column not in df.columns or column in explicit:
+            continue
+        try:
+            df[column] = df[column].astype(kind)
+        except (TypeError, ValueError):
+            continue
     return df
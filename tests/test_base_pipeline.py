@@ -0,0 +1,28 @@
+"""Тесты базового аналитического пайплайна."""
+
+import numpy as np
+import pandas as pd
+
+from rfsd.analysis import BaseAnalysisPipeline
+
+
+class _Pipeline(BaseAnalysisPipeline):
+    def run(self, **kwargs):
+        return None
+
+
+def test_columns_soa_returns_views_for_requested_columns():
+    df = pd.DataFrame(
+        {
+            "inn": ["0100000011", "7722514880"],
+            "line_2110": [1.5, 2.5],
+            "line_2400": [10, 20],
+        }
+    )
+
+    soa = _Pipeline(df).columns_soa(["line_2400", "line_2110"])
+
+    assert list(soa) == ["line_2400", "line_2110"]
+    assert soa["line_2400"].tolist() == [10, 20]
+    assert np.shares_memory(soa["line_2110"], df["line_2110"].to_numpy(copy=False))
+    assert np.shares_memory(soa["line_2400"], df["line_2400"].to_numpy(copy=False))
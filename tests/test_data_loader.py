@@ -0,0 +1,200 @@
+"""Тесты загрузки финансовой отчётности из файлов."""
+
+import datetime
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rfsd.data import load_financial_statements
+
+CSV = "inn,year,region\n0100000011,2023,77\n7722514880,2022,78\n"
+
+
+@pytest.fixture(params=["default", "c"])
+def engine_kwargs(request):
+    """Прогоняет тест и с движком по умолчанию, и с явным C-движком pandas."""
+
+    return {} if request.param == "default" else {"engine": "c"}
+
+
+def test_inn_leading_zeros_survive_with_dtype(tmp_path, engine_kwargs):
+    path = tmp_path / "data.csv"
+    path.write_text(CSV, encoding="utf-8")
+
+    df = load_financial_statements(path, dtype={"inn": str}, **engine_kwargs)
+
+    assert df["inn"].tolist() == ["0100000011", "7722514880"]
+
+
+def test_plain_call_reads_csv(tmp_path, engine_kwargs):
+    path = tmp_path / "data.csv"
+    path.write_text(CSV, encoding="utf-8")
+
+    df = load_financial_statements(path, **engine_kwargs)
+
+    assert df.shape == (2, 3)
+    assert df["year"].tolist() == [2023, 2022]
+
+
+def test_missing_file_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_financial_statements(tmp_path / "missing.csv")
+
+
+def test_blank_year_is_nullable(tmp_path, engine_kwargs):
+    path = tmp_path / "data.csv"
+    path.write_text("inn,year\n7722514880,2023\n0100000011,\n", encoding="utf-8")
+
+    df = load_financial_statements(path, **engine_kwargs)
+
+    assert str(df["year"].dtype) == "Int16"
+    assert df["year"].isna().tolist() == [False, True]
+
+
+def test_duplicate_headers(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("inn,region,region\n7722514880,77,78\n", encoding="utf-8")
+
+    df = load_financial_statements(path, engine="pyarrow")
+
+    assert df.shape == (1, 3)
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({"inn": ["7722514880", "0100000011"], "line_2110": [1.5, 2.0]})
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".pq"])
+def test_parquet_dispatch(tmp_path, frame, suffix):
+    path = tmp_path / f"data{suffix}"
+    frame.to_parquet(path)
+
+    pd.testing.assert_frame_equal(load_financial_statements(path), frame)
+    assert load_financial_statements(path, columns=["inn"]).columns.tolist() == ["inn"]
+
+
+@pytest.mark.parametrize("suffix", [".feather", ".arrow"])
+def test_feather_dispatch(tmp_path, frame, suffix):
+    path = tmp_path / f"data{suffix}"
+    frame.to_feather(path)
+
+    pd.testing.assert_frame_equal(load_financial_statements(path), frame)
+
+
+def test_parquet_cache_hit(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text(CSV, encoding="utf-8")
+
+    first = load_financial_statements(path, cache_parquet=True)
+    cache_path = tmp_path / "data.csv.parquet"
+    assert cache_path.exists()
+
+    # Подменяем содержимое кеша: свежий кеш должен читаться вместо CSV.
+    marker = first.assign(region="cached")
+    marker.to_parquet(cache_path, index=False)
+    os.utime(cache_path, (path.stat().st_mtime + 10,) * 2)
+
+    assert load_financial_statements(path, cache_parquet=True)["region"].tolist() == ["cached", "cached"]
+
+
+def test_parquet_cache_stale(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text(CSV, encoding="utf-8")
+    load_financial_statements(path, cache_parquet=True)
+
+    path.write_text("inn,year,region\n7722514880,2024,01\n", encoding="utf-8")
+    cache_path = tmp_path / "data.csv.parquet"
+    os.utime(path, (cache_path.stat().st_mtime + 10,) * 2)
+
+    df = load_financial_statements(path, cache_parquet=True)
+    assert df["year"].tolist() == [2024]
+    assert pd.read_parquet(cache_path)["year"].tolist() == [2024]
+
+
+def test_parquet_cache_does_not_touch_sibling_parquet(tmp_path, frame):
+    path = tmp_path / "data.csv"
+    path.write_text(CSV, encoding="utf-8")
+    sibling = tmp_path / "data.parquet"
+    frame.to_parquet(sibling)
+
+    load_financial_statements(path, cache_parquet=True)
+
+    pd.testing.assert_frame_equal(pd.read_parquet(sibling), frame)
+
+
+def test_dtype_dict_merges_with_defaults(tmp_path, engine_kwargs):
+    path = tmp_path / "data.csv"
+    path.write_text(CSV, encoding="utf-8")
+
+    df = load_financial_statements(path, dtype={"region": str}, **engine_kwargs)
+
+    assert df["region"].tolist() == ["77", "78"]
+    assert not isinstance(df["region"].dtype, pd.CategoricalDtype)
+    assert str(df["year"].dtype) == "Int16"
+
+
+def test_scalar_dtype_replaces_defaults(tmp_path, engine_kwargs):
+    path = tmp_path / "data.csv"
+    path.write_text(CSV, encoding="utf-8")
+
+    df = load_financial_statements(path, dtype=str, **engine_kwargs)
+
+    assert df["year"].tolist() == ["2023", "2022"]
+    assert df["inn"].tolist() == ["0100000011", "7722514880"]
+
+
+def test_default_dtypes(tmp_path, engine_kwargs):
+    path = tmp_path / "data.csv"
+    path.write_text(CSV, encoding="utf-8")
+
+    df = load_financial_statements(path, **engine_kwargs)
+
+    assert str(df["year"].dtype) == "Int16"
+    assert isinstance(df["region"].dtype, pd.CategoricalDtype)
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"engine": "pyarrow"}, {"dtype": {"inn": str}}])
+def test_empty_file(tmp_path, engine_kwargs, kwargs):
+    path = tmp_path / "empty.csv"
+    path.write_text("", encoding="utf-8")
+
+    with pytest.raises(pd.errors.EmptyDataError):
+        load_financial_statements(path, **{**engine_kwargs, **kwargs})
+
+
+def test_default_engine_matches_c_engine(tmp_path):
+    """На типичном CSV RFSD движок по умолчанию (pyarrow) совпадает с C-движком."""
+
+    path = tmp_path / "data.csv"
+    path.write_text(
+        "inn,year,region,okved_section,line_2110,line_2400,note\n"
+        "7722514880,2023,77,G,1500000.5, 12,x\n"
+        "0100000011,,01,C,NA,-3,\n"
+        "7700000001,2022,null,,0,7,N/A\n",
+        encoding="utf-8",
+    )
+
+    pd.testing.assert_frame_equal(load_financial_statements(path), load_financial_statements(path, engine="c"))
+
+
+@pytest.mark.parametrize(
+    ("text", "check"),
+    [
+        ("d\n2023-01-01\n", lambda df: isinstance(df["d"][0], datetime.date)),
+        ("a,,b\n1,2,3\n", lambda df: df.columns.tolist() == ["a", "", "b"]),
+        ("a,a\n1,2\n", lambda df: df.columns.tolist() == ["a", "a"]),
+        ("a,b\n", lambda df: df.dtypes.tolist() == [np.float64, np.float64]),
+    ],
+    ids=["iso-date", "blank-header", "duplicate-header", "header-only"],
+)
+def test_default_engine_known_differences(tmp_path, text, check):
+    """Задокументированные отличия pyarrow от C-движка (см. docstring)."""
+
+    path = tmp_path / "data.csv"
+    path.write_text(text, encoding="utf-8")
+
+    assert check(load_financial_statements(path))
+    assert not check(load_financial_statements(path, engine="c"))